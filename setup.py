@@ -83,6 +83,8 @@ setup(
         '3dviewer': ['PyOpenGL>=3.1',
                      'Pillow>=3.3', 'numpy>=1.11'],
         'camera': ['Pillow>=3.3', 'numpy>=1.11'],
+        # also needs the libjpeg-turbo library, which pip can't install
+        'turbojpeg': ['PyTurboJPEG'],
         'test': ['tox', 'pytest'],
     }
 )
@@ -21,7 +21,10 @@ __all__ = ['EvtAnimationsLoaded', 'EvtAnimationCompleted',
            'Animation', 'AnimationTrigger', 'AnimationNames', 'Triggers',
            'animation_completed_filter']
 
+import abc
 import collections
+import collections.abc
+import types
 
 from . import logger
 
@@ -41,6 +44,17 @@ class EvtAnimationCompleted(action.EvtActionCompleted):
     animation_name = "The name of the animation or trigger that completed"
 
 
+def _ignored_tracks(anim):
+    ignore_tracks = []
+    if anim.ignore_body_track:
+        ignore_tracks.append("body")
+    if anim.ignore_head_track:
+        ignore_tracks.append("head")
+    if anim.ignore_lift_track:
+        ignore_tracks.append("lift")
+    return ignore_tracks
+
+
 class Animation(action.Action):
     '''An Animation describes an actively-playing animation on a robot.'''
     def __init__(self, anim_name, loop_count, ignore_body_track=False,
@@ -64,12 +78,8 @@ class Animation(action.Action):
 
 
     def _repr_values(self):
-        all_tracks = {"body":self.ignore_body_track,
-                      "head":self.ignore_head_track,
-                      "lift":self.ignore_lift_track}
-        ignore_tracks = [k for k, v in all_tracks.items() if v]
-
-        return "anim_name=%s loop_count=%s ignore_tracks=%s" % (self.anim_name, self.loop_count, str(ignore_tracks))
+        return "anim_name=%s loop_count=%s ignore_tracks=%s" % (
+            self.anim_name, self.loop_count, _ignored_tracks(self))
 
     def _encode(self):
         return _clad_to_engine_iface.PlayAnimation(animationName=self.anim_name, numLoops=self.loop_count, ignoreBodyTrack=self.ignore_body_track,
@@ -111,13 +121,8 @@ class AnimationTrigger(action.Action):
         self.ignore_lift_track = ignore_lift_track
 
     def _repr_values(self):
-        all_tracks = {"body":self.ignore_body_track,
-                      "head":self.ignore_head_track,
-                      "lift":self.ignore_lift_track}
-        ignore_tracks = [k for k, v in all_tracks.items() if v]
-
         return "trigger=%s loop_count=%s ignore_tracks=%s use_lift_safe=%s" % (
-            self.trigger.name, self.loop_count, str(ignore_tracks), self.use_lift_safe)
+            self.trigger.name, self.loop_count, _ignored_tracks(self), self.use_lift_safe)
 
     def _encode(self):
         return _clad_to_engine_iface.PlayAnimationTrigger(
@@ -132,27 +137,50 @@ class AnimationTrigger(action.Action):
         self.dispatch_event(self._completed_event)
 
 
-class AnimationNames(event.Dispatcher, set):
+class _DispatcherSetMeta(type(event.Dispatcher), abc.ABCMeta):
+    '''Metaclass for Dispatchers that also derive from collections.abc.Set.'''
+
+
+class AnimationNames(event.Dispatcher, collections.abc.Set, metaclass=_DispatcherSetMeta):
     '''Holds the set of animation names (strings) returned from the Engine.
 
     Animation names are dynamically retrieved from the engine when the SDK
     connects to it, unlike :class:`Triggers` which are defined at runtime.
+
+    This is a read-only :class:`collections.abc.Set`, supporting membership,
+    iteration, comparisons and the ``|``, ``&``, ``-`` and ``^`` operators.
+    The names can only be changed by the engine.
     '''
     def __init__(self, conn, **kw):
-        super().__init__(self, **kw)
+        super().__init__(**kw)
         self._conn = conn
         self._loaded = False
+        # frozen snapshot of the loaded names; only replaced once a batch of
+        # names received since the last end-of-message has been merged in.
+        self._names = frozenset()
+        self._pending_names = []
 
     def __contains__(self, key):
         if not self._loaded:
             raise exceptions.AnimationsNotLoaded("Animations not yet received from engine")
-        return super().__contains__(key)
+        return key in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
 
     def __hash__(self):
         # We want to compare AnimationName instances rather than the
         # names they contain
         return id(self)
 
+    @classmethod
+    def _from_iterable(cls, it):
+        # results of the set operators are plain sets of names
+        return set(it)
+
     def refresh(self):
         '''Causes the list of animation names to be re-requested from the engine.
 
@@ -162,7 +190,8 @@ class AnimationNames(event.Dispatcher, set):
         Generates an EvtAnimationsLoaded event once completed.
         '''
         self._loaded = False
-        self.clear()
+        self._names = frozenset()
+        self._pending_names = []
         self._conn.send_msg(_clad_to_engine_iface.RequestAvailableAnimations())
 
     @property
@@ -183,16 +212,17 @@ class AnimationNames(event.Dispatcher, set):
         return await self.wait_for(EvtAnimationsLoaded, timeout=timeout)
 
     def _recv_msg_animation_available(self, evt, msg):
-        name = msg.animName
-        self.add(name)
+        self._pending_names.append(msg.animName)
 
     def _recv_msg_end_of_message(self, evt, msg):
+        if self._pending_names:
+            self._names = self._names.union(self._pending_names)
+            self._pending_names = []
         if not self._loaded:
             logger.debug("%d animations loaded", len(self))
             self._loaded = evt
             self.dispatch_event(EvtAnimationsLoaded)
 
-
 # generate names for each CLAD defined trigger
 
 _AnimTrigger = collections.namedtuple('_AnimTrigger', 'name id')
@@ -208,16 +238,26 @@ class Triggers:
 
     This class holds the set of defined animations triggers to pass to play_anim_trigger.
     """
+    #: list: Every defined animation trigger.
     trigger_list = []
 
-for (_name, _id) in _clad_to_engine_cozmo.AnimationTrigger.__dict__.items():
-    if not _name.startswith('_'):
-        trigger = _AnimTrigger(_name, _id)
-        setattr(Triggers, _name, trigger)
-        Triggers.trigger_list.append(trigger)
+    #: :class:`types.MappingProxyType`: Read-only mapping of trigger name to trigger.
+    trigger_by_name = types.MappingProxyType({})
+
+Triggers.trigger_list = [
+    _AnimTrigger(_name, _id)
+    for (_name, _id) in _clad_to_engine_cozmo.AnimationTrigger.__dict__.items()
+    if not _name.startswith('_')]
+Triggers.trigger_by_name = types.MappingProxyType(
+    {_trigger.name: _trigger for _trigger in Triggers.trigger_list})
+for _trigger in Triggers.trigger_list:
+    setattr(Triggers, _trigger.name, _trigger)
+
+
+def _is_animation(action):
+    return isinstance(action, Animation)
 
 
 def animation_completed_filter():
     '''Creates an :class:`cozmo.event.Filter` to wait specifically for an animation completed event.'''
-    return event.Filter(action.EvtActionCompleted,
-        action=lambda action: isinstance(action, Animation))
+    return event.Filter(action.EvtActionCompleted, action=_is_animation)
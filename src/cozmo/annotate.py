@@ -35,8 +35,9 @@ __all__ = ['DEFAULT_OBJECT_COLORS',
            'add_img_box_to_image', 'add_polygon_to_image', 'annotator']
 
 
-import collections
+import bisect
 import functools
+import math
 
 try:
     from PIL import Image, ImageDraw
@@ -81,6 +82,35 @@ else:
     RESAMPLE_MODE_BILINEAR = None
 
 
+# Maps (text, font, line_spacing, align) to the (left, top, right, bottom)
+# bounds of the text drawn at the origin.  Labels are recreated every frame
+# but mostly repeat, so share the measurements between ImageText instances.
+_text_bbox_cache = {}
+_TEXT_BBOX_CACHE_MAX = 512
+
+
+def _text_bbox(draw, text, font, line_spacing, align='left'):
+    key = (text, font, line_spacing, align)
+    bbox = _text_bbox_cache.get(key)
+    if bbox is None:
+        if hasattr(draw, 'textbbox'):
+            # Pillow 8.0+; textsize was removed in Pillow 10.  Glyphs may
+            # start left of or above the origin, giving a negative left/top.
+            bbox = tuple(draw.textbbox((0, 0), text, font=font,
+                                       spacing=line_spacing, align=align))
+        else:
+            bbox = (0, 0) + tuple(draw.textsize(text, font=font))
+        if len(_text_bbox_cache) >= _TEXT_BBOX_CACHE_MAX:
+            _text_bbox_cache.clear()
+        _text_bbox_cache[key] = bbox
+    return bbox
+
+
+def _text_size(draw, text, font, line_spacing, align='left'):
+    # The (width, height) used to position text within a box
+    return _text_bbox(draw, text, font, line_spacing, align)[2:]
+
+
 class ImageText:
     '''ImageText represents some text that can be applied to an image.
 
@@ -101,6 +131,9 @@ class ImageText:
             otherwise a cheaper drop-shadow is displayed. Only relevant if
             outline_color is specified.
     '''
+    __slots__ = ('text', 'position', 'align', 'color', 'font', 'line_spacing',
+                 'outline_color', 'full_outline')
+
     def __init__(self, text, position=BOTTOM_RIGHT, align="left", color="white",
                  font=None, line_spacing=3, outline_color=None, full_outline=True):
         self.text = text
@@ -123,8 +156,59 @@ class ImageText:
         Returns:
             The same :class:`PIL.ImageDraw.ImageDraw` object as was passed-in with text applied.
         '''
+        x, y, text_width, text_height = self._layout(draw, bounds)
+
+        if self.outline_color is None:
+            self._draw_text(draw, (x, y), self.color, self.font)
+            return draw
+
+        if self.full_outline:
+            outline_offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        else:
+            # just draw a drop shadow (cheaper)
+            outline_offsets = ((1, 1),)
+
+        # Pillow doesn't support outlined or shadowed text directly.
+        # Rasterize the text once into a mask, then stamp that mask multiple
+        # times to achieve the effect, rather than laying out the text again
+        # for every copy.
+        # draw.text places text at the truncated integer position and renders
+        # any fractional part as a subpixel offset; do the same here so that
+        # non-integer bounds (e.g. from scaling) render exactly as before.
+        font = self.font if self.font is not None else draw.getfont()
+        fx, fy = x - math.floor(x), y - math.floor(y)
+        mask = None
+        copies = [(dx, dy, self.outline_color) for dx, dy in outline_offsets]
+        copies.append((0, 0, self.color))
+        for dx, dy, color in copies:
+            px, py = x + dx, y + dy
+            if (px < 0 and fx) or (py < 0 and fy):
+                # A negative fractional position (text partly off the left or
+                # top of the image) becomes a negative subpixel offset, which
+                # the mask can't reproduce, so draw this copy directly.
+                self._draw_text(draw, (px, py), color, font)
+                continue
+
+            if mask is None:
+                # Size the mask to the full extent of the glyphs, which can
+                # start left of or above the text position, plus a pixel
+                # for the subpixel offset.
+                left, top, right, bottom = _text_bbox(draw, self.text, font,
+                                                      self.line_spacing, self.align)
+                left = min(0, int(math.floor(left)))
+                top = min(0, int(math.floor(top)))
+                mask = Image.new('L', (int(math.ceil(right)) - left + 2,
+                                       int(math.ceil(bottom)) - top + 2))
+                self._draw_text(ImageDraw.Draw(mask), (fx - left, fy - top), 255, font)
+
+            draw.bitmap((int(math.floor(px)) + left, int(math.floor(py)) + top), mask, fill=color)
+
+        return draw
+
+    def _layout(self, draw, bounds):
+        # Returns the (x, y) position of the text within bounds, and its size
         (bx1, by1, bx2, by2) = bounds
-        text_width, text_height = draw.textsize(self.text, font=self.font)
+        text_width, text_height = _text_size(draw, self.text, self.font, self.line_spacing)
 
         if self.position & TOP:
             y = by1
@@ -136,29 +220,26 @@ class ImageText:
         else:
             x = bx2 - text_width
 
-        # helper method for each draw call below
-        def _draw_text(pos, color):
-            draw.text(pos, self.text, font=self.font, fill=color,
-                      align=self.align, spacing=self.line_spacing)
-
-        if self.outline_color is not None:
-            # Pillow doesn't support outlined or shadowed text directly.
-            # We manually draw the text multiple times to achieve the effect.
-            if self.full_outline:
-                _draw_text((x-1, y), self.outline_color)
-                _draw_text((x+1, y), self.outline_color)
-                _draw_text((x, y-1), self.outline_color)
-                _draw_text((x, y+1), self.outline_color)
-            else:
-                # just draw a drop shadow (cheaper)
-                _draw_text((x+1, y+1), self.outline_color)
-
-        _draw_text((x,y), self.color)
-
-        return draw
+        return x, y, text_width, text_height
+
+    def _extent(self, draw, bounds):
+        # Returns the (x1, y1, x2, y2) area that render may draw to, including
+        # the outline and the padding around the text mask.
+        x, y, _, _ = self._layout(draw, bounds)
+        font = self.font if self.font is not None else draw.getfont()
+        left, top, right, bottom = _text_bbox(draw, self.text, font, self.line_spacing, self.align)
+        return (x + min(0, left) - 2, y + min(0, top) - 2, x + right + 3, y + bottom + 3)
+
+    def _draw_text(self, draw, pos, color, font):
+        # Only multi-line text needs the alignment and spacing handling
+        if '\n' in self.text:
+            draw.multiline_text(pos, self.text, font=font, fill=color,
+                                align=self.align, spacing=self.line_spacing)
+        else:
+            draw.text(pos, self.text, font=font, fill=color)
 
 
-def add_img_box_to_image(image, box, color, text=None):
+def add_img_box_to_image(image, box, color, text=None, draw=None):
     '''Draw a box on an image and optionally add text.
 
     This will draw the outline of a rectangle to the passed in image
@@ -172,20 +253,78 @@ def add_img_box_to_image(image, box, color, text=None):
         text (instance or iterable of :class:`ImageText`): The text to display
             - may be a single ImageText instance, or any iterable (eg a list
             of ImageText instances) to display multiple pieces of text.
+        draw (:class:`PIL.ImageDraw.ImageDraw`): An existing drawing context
+            for image to reuse - if None then a new one is created.
     '''
-    d = ImageDraw.Draw(image)
-    x1, y1 = box.left_x, box.top_y
-    x2, y2 = box.right_x, box.bottom_y
-    d.rectangle([x1, y1, x2, y2], outline=color)
-    if text is not None:
-        if isinstance(text, collections.Iterable):
-            for t in text:
-                t.render(d, (x1, y1, x2, y2))
-        else:
-            text.render(d, (x1, y1, x2, y2))
-
-
-def add_polygon_to_image(image, poly_points, scale, line_color, fill_color=None):
+    d = draw if draw is not None else ImageDraw.Draw(image)
+    _draw_box(d, _box_bounds(box), color, text)
+
+
+def _box_bounds(box):
+    # Returns the (x1, y1, x2, y2) bounds of an ImageBox, without the
+    # property lookups of its attributes.
+    x, y, width, height = box
+    return (x, y, x + width, y + height)
+
+
+def _box_bounds_func(scale):
+    # Returns a function giving the bounds of an ImageBox multiplied by scale,
+    # without the temporary ImageBox of box * scale.  Annotators call this
+    # once per image so that the scale check isn't repeated for every box.
+    if scale == 1:
+        return _box_bounds
+
+    def scaled_box_bounds(box):
+        x, y, width, height = box
+        x *= scale
+        y *= scale
+        width *= scale
+        height *= scale
+        return (x, y, x + width, y + height)
+    return scaled_box_bounds
+
+
+def _is_off_image(bounds, image):
+    x1, y1, x2, y2 = bounds
+    return x2 < 0 or y2 < 0 or x1 >= image.width or y1 >= image.height
+
+
+def _is_box_off_image(d, image, bounds, text, polygons=(), scale=1):
+    # True if nothing drawn for a box - its outline, its text (which may
+    # extend past the box) or any extra polygons - can land on the image.
+    if not _is_off_image(bounds, image):
+        return False
+    if isinstance(text, ImageText):
+        text = (text,)
+    elif text is None:
+        text = ()
+    for t in text:
+        extent = getattr(t, '_extent', None)
+        if extent is None:
+            # a custom label object; there's no telling where it draws
+            return False
+        if not _is_off_image(extent(d, bounds), image):
+            return False
+    for poly_points in polygons:
+        if len(poly_points) < 2:
+            continue
+        xs = [pt.x * scale for pt in poly_points]
+        ys = [pt.y * scale for pt in poly_points]
+        if not _is_off_image((min(xs), min(ys), max(xs), max(ys)), image):
+            return False
+    return True
+
+
+def _draw_box(d, bounds, color, text):
+    d.rectangle(bounds, outline=color)
+    if isinstance(text, ImageText):
+        text.render(d, bounds)
+    elif text is not None:
+        for t in text:
+            t.render(d, bounds)
+
+
+def add_polygon_to_image(image, poly_points, scale, line_color, fill_color=None, draw=None):
     '''Draw a polygon on an image
 
     This will draw a polygon on the passed-in image in the specified
@@ -200,16 +339,26 @@ def add_polygon_to_image(image, poly_points, scale, line_color, fill_color=None)
             must be a color string suitable for use with PIL - see :mod:`PIL.ImageColor`
         fill_color (string): The color for the inside of the polygon. The string value
             must be a color string suitable for use with PIL - see :mod:`PIL.ImageColor`
+        draw (:class:`PIL.ImageDraw.ImageDraw`): An existing drawing context
+            for image to reuse - if None then a new one is created.
     '''
     if len(poly_points) < 2:
         # Need at least 2 points to draw any lines
         return
-    d = ImageDraw.Draw(image)
+    d = draw if draw is not None else ImageDraw.Draw(image)
+    _draw_polygon(d, poly_points, scale, line_color, fill_color)
+
+
+def _draw_polygon(d, poly_points, scale, line_color, fill_color=None):
+    if len(poly_points) < 2:
+        # Need at least 2 points to draw any lines
+        return
 
     # Convert poly_points to the PIL format and scale them to the image
-    pil_poly_points = []
-    for pt in poly_points:
-        pil_poly_points.append((pt.x * scale, pt.y * scale))
+    if scale == 1:
+        pil_poly_points = [(pt.x, pt.y) for pt in poly_points]
+    else:
+        pil_poly_points = [(pt.x * scale, pt.y * scale) for pt in poly_points]
 
     d.polygon(pil_poly_points, fill=fill_color, outline=line_color)
 
@@ -244,11 +393,23 @@ class Annotator:
         if priority is not None:
             self.priority = priority
 
+        # ImageText labels by text, reused while the same labels keep appearing
+        self._label_cache = {}
+
     def apply(self, image, scale):
         '''Applies the annotation to the image.'''
         # should be overriden by a subclass
         raise NotImplementedError()
 
+    def _label(self, text):
+        label = self._label_cache.get(text)
+        if label is None:
+            if len(self._label_cache) >= 64:
+                self._label_cache.clear()
+            label = ImageText(text)
+            self._label_cache[text] = label
+        return label
+
     def __hash__(self):
         return id(self)
 
@@ -266,23 +427,41 @@ class ObjectAnnotator(Annotator):
         super().__init__(img_annotator)
         if object_colors is not None:
             self.object_colors = object_colors
+        # maps object class to color; rebuilt if object_colors is replaced
+        self._color_cache = {}
+        self._color_cache_src = self.object_colors
+
+    def _color_for_cls(self, cls):
+        if self._color_cache_src is not self.object_colors:
+            self._color_cache = {}
+            self._color_cache_src = self.object_colors
+        color = self._color_cache.get(cls)
+        if color is None:
+            color = _find_key_for_cls(self.object_colors, cls)
+            self._color_cache[cls] = color
+        return color
 
     def apply(self, image, scale):
         d = ImageDraw.Draw(image)
+        box_bounds = _box_bounds_func(scale)
+        color_for_cls = self._color_for_cls
+        label_for_obj = self.label_for_obj
         for obj in self.world.visible_objects:
-            color = _find_key_for_cls(self.object_colors, obj.__class__)
-            text = self.label_for_obj(obj)
-            box = obj.last_observed_image_box
-            if scale != 1:
-                box *= scale
-            add_img_box_to_image(image, box, color, text=text)
+            bounds = box_bounds(obj.last_observed_image_box)
+            text = label_for_obj(obj)
+            if _is_box_off_image(d, image, bounds, text):
+                continue
+            color = color_for_cls(obj.__class__)
+            _draw_box(d, bounds, color, text)
 
     def label_for_obj(self, obj):
         '''Fetch a label to display for the object.
 
-        Override or replace to customize.
+        Override or replace to customize.  The returned :class:`ImageText`
+        may be reused for other objects with the same label, so it should not
+        be modified.
         '''
-        return ImageText(obj.descriptive_name)
+        return self._label(obj.descriptive_name)
 
 
 class FaceAnnotator(Annotator):
@@ -300,21 +479,23 @@ class FaceAnnotator(Annotator):
 
     def apply(self, image, scale):
         d = ImageDraw.Draw(image)
+        box_bounds = _box_bounds_func(scale)
         for obj in self.world.visible_faces:
+            bounds = box_bounds(obj.last_observed_image_box)
             text = self.label_for_face(obj)
-            box = obj.last_observed_image_box
-            if scale != 1:
-                box *= scale
-            add_img_box_to_image(image, box, self.box_color, text=text)
-            add_polygon_to_image(image, obj.left_eye, scale, self.box_color)
-            add_polygon_to_image(image, obj.right_eye, scale, self.box_color)
-            add_polygon_to_image(image, obj.nose, scale, self.box_color)
-            add_polygon_to_image(image, obj.mouth, scale, self.box_color)
+            landmarks = (obj.left_eye, obj.right_eye, obj.nose, obj.mouth)
+            if _is_box_off_image(d, image, bounds, text, landmarks, scale):
+                continue
+            _draw_box(d, bounds, self.box_color, text)
+            for landmark in landmarks:
+                _draw_polygon(d, landmark, scale, self.box_color)
 
     def label_for_face(self, obj):
         '''Fetch a label to display for the face.
 
-        Override or replace to customize.
+        Override or replace to customize.  The returned :class:`ImageText`
+        may be reused for other faces with the same label, so it should not
+        be modified.
         '''
         expression = obj.known_expression
         if len(expression) > 0:
@@ -322,8 +503,8 @@ class FaceAnnotator(Annotator):
             # (display a % to make it clear the value is out of 100)
             expression += "=%s%% " % obj.expression_score
         if obj.name:
-            return ImageText('%s%s (%d)' % (expression, obj.name, obj.face_id))
-        return ImageText('(unknown%s face %d)' % (expression, obj.face_id))
+            return self._label('%s%s (%d)' % (expression, obj.name, obj.face_id))
+        return self._label('(unknown%s face %d)' % (expression, obj.face_id))
 
 
 class PetAnnotator(Annotator):
@@ -341,19 +522,22 @@ class PetAnnotator(Annotator):
 
     def apply(self, image, scale):
         d = ImageDraw.Draw(image)
+        box_bounds = _box_bounds_func(scale)
         for obj in self.world.visible_pets:
+            bounds = box_bounds(obj.last_observed_image_box)
             text = self.label_for_pet(obj)
-            box = obj.last_observed_image_box
-            if scale != 1:
-                box *= scale
-            add_img_box_to_image(image, box, self.box_color, text=text)
+            if _is_box_off_image(d, image, bounds, text):
+                continue
+            _draw_box(d, bounds, self.box_color, text)
 
     def label_for_pet(self, obj):
         '''Fetch a label to display for the pet.
 
-        Override or replace to customize.
+        Override or replace to customize.  The returned :class:`ImageText`
+        may be reused for other pets with the same label, so it should not
+        be modified.
         '''
-        return ImageText('%d: %s' % (obj.pet_id, obj.pet_type))
+        return self._label('%d: %s' % (obj.pet_id, obj.pet_type))
 
 
 class TextAnnotator(Annotator):
@@ -427,7 +611,11 @@ class ImageAnnotator(event.Dispatcher):
         self.world = world
 
         self._annotators = {}
+        # _sorted_annotators is kept in priority order (highest first, ties in
+        # insertion order); _sort_keys holds the matching (-priority, seq) keys.
         self._sorted_annotators = []
+        self._sort_keys = []
+        self._annotator_seq = 0
         self.add_annotator('objects', ObjectAnnotator(self))
         self.add_annotator('faces', FaceAnnotator(self))
         self.add_annotator('pets', PetAnnotator(self))
@@ -436,9 +624,12 @@ class ImageAnnotator(event.Dispatcher):
         #: will continue to provide a scaled image, but will not apply any annotations.
         self.annotation_enabled = True
 
-    def _sort_annotators(self):
-        self._sorted_annotators = sorted(self._annotators.values(),
-                key=lambda an: an.priority, reverse=True)
+    def _enabled_annotators(self):
+        # Annotator.enabled is a plain attribute that callers may flip at any
+        # time, so the enabled set is collected once per frame, not cached.
+        if not self.annotation_enabled:
+            return []
+        return [an for an in self._sorted_annotators if an.enabled]
 
     def add_annotator(self, name, annotator):
         '''Adds a new annotator for display.
@@ -460,7 +651,11 @@ class ImageAnnotator(event.Dispatcher):
         if not isinstance(annotator, Annotator):
             annotator = annotator(self)
         self._annotators[name] = annotator
-        self._sort_annotators()
+        self._annotator_seq += 1
+        key = (-annotator.priority, self._annotator_seq)
+        idx = bisect.bisect(self._sort_keys, key)
+        self._sort_keys.insert(idx, key)
+        self._sorted_annotators.insert(idx, annotator)
 
     def remove_annotator(self, name):
         '''Remove an annotator.
@@ -471,8 +666,10 @@ class ImageAnnotator(event.Dispatcher):
         Raises:
             KeyError if the annotator isn't registered
         '''
-        del self._annotators[name]
-        self._sort_annotators()
+        annotator = self._annotators.pop(name)
+        idx = self._sorted_annotators.index(annotator)
+        del self._sort_keys[idx]
+        del self._sorted_annotators[idx]
 
     def get_annotator(self, name):
         '''Return a named annotator.
@@ -537,42 +734,42 @@ class ImageAnnotator(event.Dispatcher):
             resample_mode (int): The resampling mode to use when scaling the
                 image. Should be either :attr:`RESAMPLE_MODE_NEAREST` (fast) or
                 :attr:`RESAMPLE_MODE_BILINEAR` (slower, but smoother).
+                Resizing is done by Pillow, so installing the drop-in
+                `Pillow-SIMD <https://github.com/uploadcare/pillow-simd>`_
+                package in place of Pillow will speed up both modes.
         Returns:
-            :class:`PIL.Image.Image`
+            :class:`PIL.Image.Image`: The annotated image.  If the image is not
+            resized and no annotations are applied, this is the original image
+            rather than a copy.
         '''
         if ImageDraw is None:
             return image
 
-        if scale is not None:
-            if scale == 1:
-                image = image.copy()
-            else:
-                image = image.resize((int(image.width * scale), int(image.height * scale)),
-                                     resample=resample_mode)
+        annotators = self._enabled_annotators()
 
-        elif fit_size is not None:
-            if fit_size == (image.width, image.height):
-                image = image.copy()
-                scale = 1
-            else:
-                img_ratio = image.width / image.height
-                fit_width, fit_height = fit_size
-                fit_ratio = fit_width / fit_height
-                if img_ratio > fit_ratio:
-                    fit_height = int(fit_width / img_ratio)
-                elif img_ratio < fit_ratio:
-                    fit_width = int(fit_height * img_ratio)
-                scale = fit_width / image.width
-                image = image.resize((fit_width, fit_height))
+        if scale is None and fit_size is not None and fit_size != (image.width, image.height):
+            img_ratio = image.width / image.height
+            fit_width, fit_height = fit_size
+            fit_ratio = fit_width / fit_height
+            if img_ratio > fit_ratio:
+                fit_height = int(fit_width / img_ratio)
+            elif img_ratio < fit_ratio:
+                fit_width = int(fit_height * img_ratio)
+            scale = fit_width / image.width
+            image = image.resize((fit_width, fit_height))
+
+        elif scale is not None and scale != 1:
+            image = image.resize((int(image.width * scale), int(image.height * scale)),
+                                 resample=resample_mode)
 
         else:
+            # No resize needed - only copy if annotations would otherwise
+            # be drawn onto the caller's image.
             scale = 1
+            if annotators:
+                image = image.copy()
 
-        if not self.annotation_enabled:
-            return image
-
-        for an in self._sorted_annotators:
-            if an.enabled:
-                an.apply(image, scale)
+        for an in annotators:
+            an.apply(image, scale)
 
         return image
@@ -21,13 +21,7 @@ __all__ = ['AudioEvents']
 
 import collections
 
-from . import logger
-
-from . import action
-from . import exceptions
-from . import event
-
-from ._clad import _clad_to_engine_iface, _clad_to_engine_cozmo, _clad_to_engine_anki, CladEnumWrapper
+from ._clad import _clad_to_engine_anki, CladEnumWrapper
 
 
 # generate names for each CLAD defined trigger
@@ -17,11 +17,24 @@ __all__ = []
 import threading
 
 import asyncio
-import concurrent.futures
 import functools
-import inspect
+import operator
 import traceback
 import types
+import weakref
+
+
+# Bound once; these are consulted on every attribute access through a _SyncProxy.
+_MethodType = types.MethodType
+_FunctionType = types.FunctionType
+_iscoroutine = asyncio.iscoroutine
+_iscoroutinefunction = asyncio.iscoroutinefunction
+
+# (loop, abort_future) arguments for _dispatch_coroutine, fetched in one call.
+# Only ever applied to wrapped objects: used on a _SyncProxy it would recurse
+# through __getattribute__.  Wrapped objects are always event.Dispatcher
+# instances, so _loop is set by the time they are proxied.
+_dispatch_context = operator.attrgetter('_loop', '_sync_abort_future')
 
 
 class _MetaBase(type):
@@ -83,6 +96,8 @@ class _Factory:
 
     def __init__(self, factory):
         self._wrapped_factory = factory
+        # partials built by __get__, keyed by the instance they were built for
+        self._partials = weakref.WeakKeyDictionary()
 
     def __get__(self, ins, owner):
         sync_thread_id = getattr(ins, '_sync_thread_id', None)
@@ -90,12 +105,27 @@ class _Factory:
         if sync_thread_id:
             # Object instance is running in sync mode
             return _SyncFactory(self._wrapped_factory, loop, sync_thread_id, ins._sync_abort_future)
+
+        # Reuse the partial from a previous lookup on this instance, unless the
+        # loop has been replaced since.
+        try:
+            cached = self._partials.get(ins)
+        except TypeError:
+            # class access, or an instance that can't be weakly referenced
+            ins = cached = None
+        if cached is not None and cached.keywords['loop'] is loop:
+            return cached
+
         # Pass through to the factory.  Set loop here as a convenience as all
         # Cozmo objects require it by virtue of inheriting from event.Dispatcher
-        return functools.partial(self._wrapped_factory, loop=loop)
+        factory = functools.partial(self._wrapped_factory, loop=loop)
+        if ins is not None:
+            self._partials[ins] = factory
+        return factory
 
     def __set__(self, ins, val):
         self._wrapped_factory = val
+        self._partials.clear()
 
 
 def _SyncFactory(f, loop, thread_id, sync_abort_future):
@@ -106,6 +136,9 @@ def _SyncFactory(f, loop, thread_id, sync_abort_future):
         if 'loop' not in kw:
             kw['loop'] = loop
         obj = f(*a, **kw)
+        if getattr(obj, '_sync_thread_id', None) is None:
+            # the proxy would pass every access straight through anyway
+            return obj
         return  _mkproxy(obj)
     return factory
 
@@ -134,55 +167,71 @@ class _SyncProxy:
     Returned co-routines functions and Futures are waited upon until completion.
     '''
 
+    __slots__ = ('__wrapped__', '_sync_tid', '_dispatch_ctx', '_method_cache', '__weakref__')
+
     def __init__(self, wrapped):
         self.__wrapped__ = wrapped
 
-    def __getattribute__(self, name):
-        wrapped = object.__getattribute__(self, '__wrapped__')
+    def __getattribute__(self, name, _get_ident=threading.get_ident,
+                         _getattr=object.__getattribute__):
+        wrapped = _getattr(self, '__wrapped__')
         if name == '__wrapped__':
             return wrapped
 
-        # if name points to a property, this will execute the property getter
-        # and return the value, else returns the value according to usual
-        # lookup rules.
-        value = object.__getattribute__(wrapped, name)
-
         # determine whether the call is being invoked locally, from within the
         # event loop's native thread, or elsewhere (usually the main thread)
-        thread_id = object.__getattribute__(wrapped, '_sync_thread_id')
-        is_local_thread = thread_id is None or threading.get_ident() == thread_id
-
-        if is_local_thread:
+        thread_id = _getattr(self, '_sync_tid')
+        if thread_id is None or _get_ident() == thread_id:
             # passthru/no-op if being called from the same thread as the object
             # was created from.
+            return _getattr(wrapped, name)
+
+        # if name points to a property, this will execute the property getter
+        # and return the value, else returns the value according to usual
+        # lookup rules.
+        value = _getattr(wrapped, name)
+
+        value_type = type(value)
+        if value_type is _MethodType:
+            func, bound_to = value.__func__, value.__self__
+        elif value_type is _FunctionType:
+            func, bound_to = value, None
+        elif _iscoroutine(value):
+            return _dispatch_coroutine(value, *_getattr(self, '_dispatch_ctx'))
+        else:
             return value
 
-        if inspect.ismethod(value) and not asyncio.iscoroutinefunction(value):
+        # Reuse the dispatcher built by an earlier lookup of the same callable
+        cache = _getattr(self, '_method_cache')
+        cached = cache.get(name)
+        if cached is not None and cached[0] is func and cached[1] is bound_to:
+            return cached[2]
+
+        if not _iscoroutinefunction(value):
+            if value_type is _MethodType:
                 # Wrap the sync method into a coroutine that can be dispatched
                 # from the same thread as the main event loop is running in
-                f = value.__func__
-                f = _to_coroutine(f)
-                value = types.MethodType(f, wrapped)
-                #value = types.MethodType(f, self)
-
-        elif inspect.isfunction(value) and not asyncio.iscoroutinefunction(value):
-            # Dispatch functions in the main event loop thread too
-            value = _to_coroutine(value)
-
-        if inspect.isawaitable(value):
-            return _dispatch_coroutine(value, wrapped._loop, wrapped._sync_abort_future)
-
-        elif asyncio.iscoroutinefunction(value):
-            # Wrap coroutine into synchronous dispatch
-            @functools.wraps(value)
-            def wrap(*a, **kw):
-                return  _dispatch_coroutine(value(*a, **kw), wrapped._loop, wrapped._sync_abort_future)
-            return wrap
-
-        return value
+                value = _MethodType(_to_coroutine(func), wrapped)
+            else:
+                # Dispatch functions in the main event loop thread too
+                value = _to_coroutine(value)
+
+        # Wrap coroutine into synchronous dispatch
+        loop, abort_future = _getattr(self, '_dispatch_ctx')
+        @functools.wraps(func)
+        def wrap(*a, **kw):
+            return  _dispatch_coroutine(value(*a, **kw), loop, abort_future)
+        cache[name] = (func, bound_to, wrap)
+        return wrap
 
     def __setattr__(self, name, value):
         if name == '__wrapped__':
+            # the wrapped object's sync thread, loop and abort future are fixed
+            # at construction, so keep copies alongside it to save lookups on
+            # every access.
+            super().__setattr__('_sync_tid', value._sync_thread_id)
+            super().__setattr__('_dispatch_ctx', _dispatch_context(value))
+            super().__setattr__('_method_cache', {})
             return super().__setattr__(name, value)
         wrapped = object.__getattribute__(self, '__wrapped__')
         return wrapped.__setattr__(name, value)
@@ -193,30 +242,51 @@ class _SyncProxy:
 
 
 def _to_coroutine(f):
-    @functools.wraps(f)
+    # Only ever called through the dispatch wrapper built in
+    # _SyncProxy.__getattribute__, which carries f's metadata itself.
     async def wrap(*a, **kw):
         return f(*a, **kw)
     return wrap
 
 
+# Dunder names that _SyncProxy implements itself rather than passing through,
+# along with the class layout attributes that generated proxies define
+# themselves.
+_PROXY_SKIP = frozenset(('__class__', '__new__', '__init__', '__getattribute__', '__setattr__', '__repr__',
+                         '__slots__', '__dict__', '__weakref__'))
+
+# Generated _SyncProxy subclasses, keyed by the class of the wrapped object.
+_proxy_classes = {}
+_proxy_classes_lock = threading.Lock()
+
+
 def _mkproxy(obj):
     '''Create a _SyncProxy for an object.'''
-    # dynamically generate a class tailored for the wrapped object.
-    d = {}
     cls = obj.__class__
+    proxy_cls = _proxy_classes.get(cls)
+    if proxy_cls is None:
+        with _proxy_classes_lock:
+            proxy_cls = _proxy_classes.get(cls)
+            if proxy_cls is None:
+                proxy_cls = _proxy_classes[cls] = _mkproxy_class(cls)
+    proxy = proxy_cls(obj)
+    obj.__wrapper__ = proxy
+    return proxy
+
+
+def _mkproxy_class(cls):
+    '''Generate a _SyncProxy subclass tailored for instances of cls.'''
+    d = {'__slots__': ()}
     for name in dir(cls):
-        if ((name.endswith('__') and name.startswith('__'))
-            and name not in ('__class__', '__new__', '__init__', '__getattribute__', '__setattr__', '__repr__')):
-                d[name] = _mkpt(cls, name)
+        if (len(name) > 4 and name[:2] == '__' == name[-2:]
+                and name not in _PROXY_SKIP):
+            d[name] = _mkpt(cls, name)
 
-    if hasattr(obj, '__aenter__'):
+    if hasattr(cls, '__aenter__'):
         d['__enter__'] = lambda self: self.__wrapper__.__aenter__()
         d['__exit__'] = lambda self, *a: self.__wrapper__.__aexit__(*a)
 
-    cls = type("_proxy_"+obj.__class__.__name__, (_SyncProxy,), d)
-    proxy = cls(obj)
-    obj.__wrapper__ = proxy
-    return proxy
+    return type("_proxy_"+cls.__name__, (_SyncProxy,), d)
 
 
 def _dispatch_coroutine(co, loop, abort_future):
@@ -230,8 +300,20 @@ def _dispatch_coroutine(co, loop, abort_future):
     clean shutdown in the case of an exception.
     '''
     fut = asyncio.run_coroutine_threadsafe(co, loop)
-    result = concurrent.futures.wait((fut, abort_future), return_when=concurrent.futures.FIRST_COMPLETED)
-    result =  list(result.done)[0].result()
+    done = threading.Event()
+    waiters = _abort_waiters(abort_future)
+    waiters.add(done)
+    try:
+        # abort_future's callback may already have run, before done was added.
+        if not abort_future.done():
+            fut.add_done_callback(lambda _: done.set())
+            done.wait()
+    finally:
+        waiters.discard(done)
+    if fut.done():
+        result = fut.result()
+    else:
+        result = abort_future.result()
     if getattr(result, '__wrapped__', None) is None:
         # If the call retuned the wrapped contents of a _SyncProxy then return
         # the enclosing proxy instead to the sync caller
@@ -239,3 +321,28 @@ def _dispatch_coroutine(co, loop, abort_future):
         if wrapper is not None:
             result = wrapper
     return result
+
+
+# Events of sync callers currently blocked in _dispatch_coroutine, keyed by
+# the abort future that should wake them.
+_abort_waiters_by_future = weakref.WeakKeyDictionary()
+_abort_waiters_lock = threading.Lock()
+
+
+def _abort_waiters(abort_future):
+    '''Returns the set of events to wake when abort_future completes.
+
+    A single done callback is registered per abort future, rather than one per
+    dispatched call, as concurrent futures provide no way to remove callbacks.
+    '''
+    waiters = _abort_waiters_by_future.get(abort_future)
+    if waiters is None:
+        with _abort_waiters_lock:
+            waiters = _abort_waiters_by_future.get(abort_future)
+            if waiters is None:
+                waiters = _abort_waiters_by_future[abort_future] = set()
+                def wake_all(_):
+                    for ev in list(waiters):
+                        ev.set()
+                abort_future.add_done_callback(wake_all)
+    return waiters
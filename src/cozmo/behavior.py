@@ -163,7 +163,8 @@ class Behavior(event.Dispatcher):
         # Wait for behavior to start first - it can't complete without starting,
         # and if it doesn't start within a fraction of a second it probably
         # never will
-        await self.wait_for_started()
+        if not self.is_running:
+            await self.wait_for_started()
         await self.wait_for(EvtBehaviorStopped, timeout=timeout)
 
 
@@ -26,11 +26,17 @@ Generally, however, it is more useful to observe
 :class:`cozmo.world.EvtNewCameraImage` events, which include the raw camera
 images along with annotated images, which can illustrate objects the robot
 has identified.
+
+Camera images are decoded with Pillow.  If the optional PyTurboJPEG package
+is installed (``pip install 'cozmo[camera,turbojpeg]'``) along with the
+libjpeg-turbo library it uses, images are decoded with libjpeg-turbo instead,
+which is faster.
 '''
 
 # __all__ should order by constants, event classes, other classes, functions.
 __all__ = ['EvtNewRawCameraImage', 'EvtRobotObservedMotion', 'CameraConfig', 'Camera']
 
+import concurrent.futures
 import functools
 import io
 
@@ -43,6 +49,12 @@ except ImportError as exc:
     np = None
     _img_processing_available = exc
 
+# Optional: decode frames with libjpeg-turbo directly via PyTurboJPEG, if installed.
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+
 
 from . import event
 from . import logger
@@ -233,6 +245,13 @@ class Camera(event.Dispatcher):
         self._gain = 0.0
         self._exposure_ms = 0
         self._auto_exposure_enabled = True
+        # reused to assemble the chunks of each image; grown as needed
+        self._scratch_buffer = None
+        # single worker thread that completed images are decoded on
+        self._decode_executor = None
+        self._decode_in_progress = False
+        # newest completed image waiting for the current decode to finish
+        self._decode_pending = None
 
         if np is None:
             logger.warning("Camera image processing not available due to missing NumPy or Pillow packages: %s" % _img_processing_available)
@@ -397,10 +416,12 @@ class Camera(event.Dispatcher):
             self._partial_image_id = msg.imageId
             self._partial_metadata = msg
 
+            # chunks normally carry at most IMAGE_CHUNK_SIZE bytes of encoded
+            # data; the buffer is grown below for any that carry more.
             max_size = msg.imageChunkCount * _clad_to_game_cozmo.ImageConstants.IMAGE_CHUNK_SIZE
-            width, height = RESOLUTIONS[msg.resolution]
-            max_size = width * height * 3 # 3 bytes (RGB) per pixel
-            self._partial_data = np.empty(max_size, dtype=np.uint8)
+            if self._scratch_buffer is None or self._scratch_buffer.size < max_size:
+                self._scratch_buffer = np.empty(max_size, dtype=np.uint8)
+            self._partial_data = self._scratch_buffer
 
         if msg.chunkId != (self._last_chunk_id + 1) or msg.imageId != self._partial_image_id:
             logger.debug("Image missing chunks; discarding (last_chunk_id=%d partial_image_id=%s)",
@@ -409,9 +430,20 @@ class Camera(event.Dispatcher):
             self._partial_invalid = True
             return
 
+        data = msg.data
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            # a list of ints converts to bytes in one C-level pass, which is
+            # cheaper than NumPy converting each element in a slice assignment.
+            data = bytes(data)
         offset = self._partial_size
-        self._partial_data[offset:offset+len(msg.data)] = msg.data
-        self._partial_size += len(msg.data)
+        end = offset + len(data)
+        if end > self._partial_data.size:
+            logger.debug("Image chunk larger than expected; growing buffer to %d bytes", end)
+            grown = np.empty(max(end, self._partial_data.size * 2), dtype=np.uint8)
+            grown[:offset] = self._partial_data[:offset]
+            self._partial_data = self._scratch_buffer = grown
+        self._partial_data[offset:end] = np.frombuffer(data, dtype=np.uint8)
+        self._partial_size = end
         self._last_chunk_id = msg.chunkId
 
         if msg.chunkId == (msg.imageChunkCount - 1):
@@ -453,127 +485,207 @@ class Camera(event.Dispatcher):
             else:
                 data = _minigray_to_jpeg(data, width, height)
                 
-        image = Image.open(io.BytesIO(data)).convert('RGB')
-
-        # Color images need to be resized to the proper resolution
         if is_color_image:
+            # Color images need to be resized to the proper resolution
             size = RESOLUTIONS[self._partial_metadata.resolution]
-            image = image.resize(size)
-        
+        else:
+            size = None
+
+        # The data is copied, as the chunk buffer is reused for the next image.
+        job = (data.tobytes(), size)
+        if self._decode_in_progress:
+            # Only the newest image is kept waiting; anything older is stale
+            # by the time the worker is free.
+            if self._decode_pending is not None:
+                logger.debug("Camera image decoding fell behind; dropping an image")
+            self._decode_pending = job
+        else:
+            self._start_decode(job)
+
+    def _start_decode(self, job):
+        # Decode on a worker thread so that the chunks of the next image can
+        # be received meanwhile.  Only one image is decoded at a time, which
+        # keeps them in order.
+        if self._decode_executor is None:
+            self._decode_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._decode_in_progress = True
+        fut = self._loop.run_in_executor(self._decode_executor, _decode_image, *job)
+        fut.add_done_callback(self._on_image_decoded)
+
+    def _on_image_decoded(self, fut):
+        self._decode_in_progress = False
+        if self._decode_pending is not None:
+            job, self._decode_pending = self._decode_pending, None
+            self._start_decode(job)
+
+        if fut.cancelled():
+            return
+        try:
+            image = fut.result()
+        except Exception as e:
+            logger.warning("Failed to decode camera image: %s", e)
+            return
+
         self._latest_image = image
         self.dispatch_event(EvtNewRawCameraImage, image=image)
 
+    def _close(self):
+        # Called by the connection when it shuts down or aborts.
+        self._decode_pending = None
+        if self._decode_executor is not None:
+            self._decode_executor.shutdown(wait=False)
+            self._decode_executor = None
+
 
     #### Public Event Handlers ####
 
 
+@functools.lru_cache(maxsize=None)
+def _turbojpeg_decoder():
+    '''Returns a TurboJPEG decoder, or None if PyTurboJPEG can't be used.'''
+    if TurboJPEG is None:
+        return None
+    try:
+        # loads the libturbojpeg shared library
+        return TurboJPEG()
+    except OSError as exc:
+        logger.warning("Could not load libturbojpeg, decoding camera images with Pillow: %s", exc)
+        return None
+
+
+@_require_img_processing
+def _decode_image(data, size=None):
+    '''Decodes JPEG data to an RGB PIL image, resized to size if given.'''
+    turbojpeg = _turbojpeg_decoder()
+    if turbojpeg is not None:
+        image = Image.fromarray(turbojpeg.decode(data, pixel_format=TJPF_RGB))
+    else:
+        image = Image.open(io.BytesIO(data)).convert('RGB')
+    if size is not None:
+        image = image.resize(size)
+    return image
+
+
+# JPEG headers prepended to the mini gray/color payloads by _mini_to_jpeg_helper
+# (height and width are patched in at 0x5E..0x61).
+_MINIGRAY_JPEG_HEADER = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
+    0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, #// 0x19 = QTable
+    0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
+    0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
+    0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
+
+    #//0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0xF0, #// 0x5E = Height x Width
+    0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x01, 0x28, #// 0x5E = Height x Width
+
+    #//0x01, 0x40, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+    0x01, 0x90, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+
+    0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
+    0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
+    0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
+    0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
+    0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
+    0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
+    0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
+    0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
+    0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
+    0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
+    0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
+    0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
+    0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
+    0x00, 0x00, 0x3F, 0x00
+    ])
+
+_MINICOLOR_JPEG_HEADER = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
+    0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, # 0x19 = QTable
+    0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
+    0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
+    0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
+    0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 17, # 8+3*components
+    0x08, 0x00, 0xF0, # 0x5E = Height x Width
+    0x01, 0x40,
+    0x03, # 3 components
+    0x01, 0x21, 0x00, # Y 2x1 res
+    0x02, 0x11, 0x00, # Cb
+    0x03, 0x11, 0x00, # Cr
+    0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
+    0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
+    0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
+    0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
+    0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
+    0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
+    0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
+    0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
+    0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
+    0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
+    0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
+    0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
+    0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
+    0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
+    0xFF, 0xDA, 0x00, 12,
+    0x03, # 3 components
+    0x01, 0x00, # Y
+    0x02, 0x00, # Cb same AC/DC
+    0x03, 0x00, # Cr same AC/DC
+    0x00, 0x3F, 0x00
+    ])
+
+
 @_require_img_processing
 def _minigray_to_jpeg(minigray, width, height):
         "Converts miniGrayToJpeg format to normal jpeg format"
         #This should be 'exactly' what is done in the miniGrayToJpeg function in encodedImage.cpp
-        header50 = np.array([
-              0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
-              0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, #// 0x19 = QTable
-              0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
-              0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
-              0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
-
-              #//0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0xF0, #// 0x5E = Height x Width
-              0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x01, 0x28, #// 0x5E = Height x Width
-
-              #//0x01, 0x40, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-              0x01, 0x90, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-
-              0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
-              0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
-              0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
-              0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
-              0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
-              0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
-              0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
-              0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
-              0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
-              0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
-              0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
-              0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
-              0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
-              0x00, 0x00, 0x3F, 0x00
-            ], dtype=np.uint8)
-        
-        return _mini_to_jpeg_helper(minigray, width, height, header50)
+        return _mini_to_jpeg_helper(minigray, width, height, _MINIGRAY_JPEG_HEADER)
 
 @_require_img_processing
 def _minicolor_to_jpeg(minicolor, width, height):
         "Converts miniColorToJpeg format to normal jpeg format"
         #This should be 'exactly' what is done in the miniColorToJpeg function in encodedImage.cpp
-        header = np.array([
-             0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01,
-             0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43, 0x00, 0x10, 0x0B, 0x0C, 0x0E, 0x0C, 0x0A, 0x10, # 0x19 = QTable
-             0x0E, 0x0D, 0x0E, 0x12, 0x11, 0x10, 0x13, 0x18, 0x28, 0x1A, 0x18, 0x16, 0x16, 0x18, 0x31, 0x23,
-             0x25, 0x1D, 0x28, 0x3A, 0x33, 0x3D, 0x3C, 0x39, 0x33, 0x38, 0x37, 0x40, 0x48, 0x5C, 0x4E, 0x40,
-             0x44, 0x57, 0x45, 0x37, 0x38, 0x50, 0x6D, 0x51, 0x57, 0x5F, 0x62, 0x67, 0x68, 0x67, 0x3E, 0x4D,
-             0x71, 0x79, 0x70, 0x64, 0x78, 0x5C, 0x65, 0x67, 0x63, 0xFF, 0xC0, 0x00, 17, # 8+3*components
-             0x08, 0x00, 0xF0, # 0x5E = Height x Width
-             0x01, 0x40,
-             0x03, # 3 components
-             0x01, 0x21, 0x00, # Y 2x1 res
-             0x02, 0x11, 0x00, # Cb
-             0x03, 0x11, 0x00, # Cr
-             0xFF, 0xC4, 0x00, 0xD2, 0x00, 0x00, 0x01, 0x05, 0x01, 0x01,
-             0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04,
-             0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x10, 0x00, 0x02, 0x01, 0x03, 0x03, 0x02, 0x04, 0x03,
-             0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D, 0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12,
-             0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
-             0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0A, 0x16,
-             0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28, 0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39,
-             0x3A, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
-             0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79,
-             0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89, 0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98,
-             0x99, 0x9A, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
-             0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0xCA, 0xD2, 0xD3, 0xD4,
-             0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA,
-             0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA,
-             0xFF, 0xDA, 0x00, 12,
-             0x03, # 3 components
-             0x01, 0x00, # Y
-             0x02, 0x00, # Cb same AC/DC
-             0x03, 0x00, # Cr same AC/DC
-             0x00, 0x3F, 0x00
-            ], dtype=np.uint8)
-
-        return _mini_to_jpeg_helper(minicolor, width, height, header)
+        return _mini_to_jpeg_helper(minicolor, width, height, _MINICOLOR_JPEG_HEADER)
+
+@functools.lru_cache(maxsize=16)
+def _sized_jpeg_header(header, width, height):
+    '''Returns header as a uint8 array with the image dimensions patched in.'''
+    sized = np.frombuffer(header, dtype=np.uint8).copy()
+    sized[0x5e] = height >> 8
+    sized[0x5f] = height & 0xff
+    sized[0x60] = width  >> 8
+    sized[0x61] = width  & 0xff
+    # shared between calls, so make sure it isn't modified
+    sized.flags.writeable = False
+    return sized
 
 @_require_img_processing
 def _mini_to_jpeg_helper(mini, width, height, header):
-        bufferIn = mini.tolist()
         currLen = len(mini)
 
         headerLength = len(header)
-        # For worst case expansion
-        bufferOut = np.array([0] * (currLen*2 + headerLength), dtype=np.uint8)
+        # For worst case expansion (every byte is written before it's returned)
+        bufferOut = np.empty(currLen*2 + headerLength, dtype=np.uint8)
 
-        for i in range(headerLength):
-            bufferOut[i] = header[i]
+        bufferOut[:headerLength] = _sized_jpeg_header(header, width, height)
 
-        bufferOut[0x5e] = height >> 8
-        bufferOut[0x5f] = height & 0xff
-        bufferOut[0x60] = width  >> 8
-        bufferOut[0x61] = width  & 0xff
         # Remove padding at the end
-        while (bufferIn[currLen-1] == 0xff):
-            currLen -= 1
-
-        off = headerLength
-        for i in range(currLen-1):
-            bufferOut[off] = bufferIn[i+1]
-            off += 1
-            if (bufferIn[i+1] == 0xff):
-                bufferOut[off] = 0
-                off += 1
+        currLen -= int(np.argmax(mini[::-1] != 0xff))
+        if currLen and mini[currLen-1] == 0xff:
+            # nothing but padding
+            currLen = 0
+
+        # Copy the payload after the leading color flag byte, stuffing a 0x00
+        # after each 0xFF so that it isn't read as a marker.  Every byte is
+        # shifted along by the number of 0xFF bytes that precede it.
+        body = mini[1:currLen]
+        is_ff = body == 0xff
+        positions = np.arange(headerLength, headerLength + len(body))
+        positions[1:] += np.cumsum(is_ff)[:-1]
+        bufferOut[positions] = body
+        bufferOut[positions[is_ff] + 1] = 0
+        off = headerLength + len(body) + int(np.count_nonzero(is_ff))
 
         bufferOut[off] = 0xff
         off += 1
         bufferOut[off] = 0xD9
 
-        bufferOut[:off]
-        return np.asarray(bufferOut)
+        return bufferOut[:off+1]
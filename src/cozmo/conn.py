@@ -194,6 +194,7 @@ class CozmoConnection(event.Dispatcher, clad_protocol.CLADProtocol):
             self._running = False
             event._abort_futures(exceptions.SDKShutdown())
             self._stop_dispatcher()
+            self._close_robots()
             self.transport.close()
 
     def abort(self, exc):
@@ -205,9 +206,15 @@ class CozmoConnection(event.Dispatcher, clad_protocol.CLADProtocol):
             # remainder are aborted.
             self._loop.call_soon(lambda: event._abort_futures(exc))
             self._stop_dispatcher()
+            self._close_robots()
             self.transport.close()
 
 
+    def _close_robots(self):
+        # Release per-robot resources, such as the camera's decode thread.
+        for robot in self._robots.values():
+            robot.camera._close()
+
     def msg_received(self, msg):
         '''Receives low level communication messages from the engine.'''
         if not self._running:
@@ -485,10 +485,21 @@ class Dispatcher(base.Base):
 
         self.add_event_handler(event, f)
         if timeout:
-             return await asyncio.wait_for(f, timeout, loop=self._loop)
+            # Time out the future directly rather than through asyncio.wait_for,
+            # which wraps it in a second waiter future on every call.
+            timer = self._loop.call_later(timeout, _timeout_future, f)
+            try:
+                return await f
+            finally:
+                timer.cancel()
         return await f
 
 
+def _timeout_future(fut):
+    if not fut.done():
+        fut.set_exception(asyncio.TimeoutError())
+
+
 def oneshot(f):
     '''Event handler decorator; causes the handler to only be dispatched to once.'''
     f._oneshot_handler = True
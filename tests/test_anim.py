@@ -0,0 +1,122 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import asyncio
+import collections.abc
+import random
+from types import SimpleNamespace
+
+from cozmo import anim
+from cozmo import exceptions
+
+
+class TriggersTests(unittest.TestCase):
+    def test_trigger_list_is_shuffleable(self):
+        # examples/tutorials/01_basics/12_random_animation.py shuffles this in place
+        triggers = anim.Triggers.trigger_list
+        self.assertIsInstance(triggers, list)
+        random.shuffle(triggers)
+        self.assertEqual(len(triggers), len(anim.Triggers.trigger_by_name))
+
+    def test_trigger_attributes(self):
+        for trigger in anim.Triggers.trigger_list:
+            self.assertIs(getattr(anim.Triggers, trigger.name), trigger)
+            self.assertIs(anim.Triggers.trigger_by_name[trigger.name], trigger)
+
+
+class _FakeConn:
+    def __init__(self):
+        self.sent = []
+
+    def send_msg(self, msg):
+        self.sent.append(msg)
+
+
+class AnimationNamesTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        # let any dispatched events run before the loop is closed
+        self.addCleanup(self.loop.run_until_complete, asyncio.sleep(0))
+        self.names = anim.AnimationNames(_FakeConn(), loop=self.loop)
+
+    def receive(self, *names):
+        for name in names:
+            self.names._recv_msg_animation_available(None, SimpleNamespace(animName=name))
+        self.names._recv_msg_end_of_message(object(), None)
+
+    def test_not_loaded(self):
+        self.assertFalse(self.names.is_loaded)
+        with self.assertRaises(exceptions.AnimationsNotLoaded):
+            'anim_bored_01' in self.names
+
+    def test_names_pending_until_end_of_message(self):
+        self.names._recv_msg_animation_available(None, SimpleNamespace(animName='anim_bored_01'))
+        self.assertEqual(len(self.names), 0)
+        self.names._recv_msg_end_of_message(object(), None)
+        self.assertTrue(self.names.is_loaded)
+        self.assertIn('anim_bored_01', self.names)
+        self.assertEqual(len(self.names), 1)
+
+    def test_end_of_message_merges_pending_names(self):
+        self.receive('anim_bored_01', 'anim_bored_02')
+        self.receive('anim_bored_02', 'anim_sneeze_01')
+        self.assertEqual(set(self.names), {'anim_bored_01', 'anim_bored_02', 'anim_sneeze_01'})
+        self.assertEqual(self.names._pending_names, [])
+
+    def test_end_of_message_without_pending_names(self):
+        self.receive('anim_bored_01')
+        self.receive()
+        self.assertEqual(set(self.names), {'anim_bored_01'})
+
+    def test_loaded_event_dispatched_once(self):
+        loaded = []
+        self.names.add_event_handler(anim.EvtAnimationsLoaded, lambda evt, **kw: loaded.append(evt))
+        self.receive('anim_bored_01')
+        self.receive('anim_bored_02')
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(len(loaded), 1)
+
+    def test_refresh_discards_names(self):
+        self.receive('anim_bored_01')
+        self.names._recv_msg_animation_available(None, SimpleNamespace(animName='anim_bored_02'))
+        self.names.refresh()
+        self.assertFalse(self.names.is_loaded)
+        self.assertEqual(len(self.names), 0)
+        self.assertEqual(len(self.names._conn.sent), 1)
+        self.receive('anim_sneeze_01')
+        self.assertEqual(set(self.names), {'anim_sneeze_01'})
+
+    def test_set_interface(self):
+        self.receive('a', 'b')
+        self.assertIsInstance(self.names, collections.abc.Set)
+        self.assertEqual(self.names, {'a', 'b'})
+        self.assertEqual({'a', 'b'}, self.names)
+        self.assertNotEqual(self.names, {'a'})
+        self.assertTrue(self.names <= {'a', 'b', 'c'})
+        self.assertTrue({'a'} < self.names)
+        self.assertEqual(self.names | {'c'}, {'a', 'b', 'c'})
+        self.assertEqual({'c'} | self.names, {'a', 'b', 'c'})
+        self.assertEqual(self.names & {'a', 'c'}, {'a'})
+        self.assertEqual(self.names - {'a'}, {'b'})
+        self.assertEqual({'a', 'c'} - self.names, {'c'})
+        self.assertEqual(self.names ^ {'b', 'c'}, {'a', 'c'})
+        self.assertTrue(self.names.isdisjoint({'c'}))
+        self.assertEqual(sorted(self.names), ['a', 'b'])
+
+    def test_hashed_by_identity(self):
+        other = anim.AnimationNames(_FakeConn(), loop=self.loop)
+        self.assertEqual(len({self.names, other}), 2)
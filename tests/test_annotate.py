@@ -0,0 +1,142 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw, ImageFont
+
+from cozmo import annotate
+from cozmo import util
+
+
+def _render_with_draw_text(text, draw, bounds):
+    # Reference rendering: draw the text once per outline offset, as
+    # ImageText.render did before it rasterized the text into a mask.
+    (bx1, by1, bx2, by2) = bounds
+    text_width, text_height = annotate._text_size(draw, text.text, text.font, text.line_spacing)
+    y = by1 if text.position & annotate.TOP else by2 - text_height
+    x = bx1 if text.position & annotate.LEFT else bx2 - text_width
+
+    def draw_text(pos, color):
+        draw.text(pos, text.text, font=text.font, fill=color,
+                  align=text.align, spacing=text.line_spacing)
+
+    if text.full_outline:
+        for pos in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+            draw_text(pos, text.outline_color)
+    else:
+        draw_text((x+1, y+1), text.outline_color)
+    draw_text((x, y), text.color)
+
+
+def _truetype_font(size):
+    # Pillow 10.1+ bundles a TrueType default font when FreeType is available
+    try:
+        font = ImageFont.load_default(size=size)
+    except TypeError:
+        font = None
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        raise unittest.SkipTest("No TrueType font available")
+    return font
+
+
+class ImageTextTests(unittest.TestCase):
+    def assertRendersAsDrawText(self, bounds, font=None, strings=("Face 1", "Cube\nid 3")):
+        for string in strings:
+            for full_outline in (True, False):
+                for position in (annotate.TOP_LEFT, annotate.BOTTOM_RIGHT):
+                    text = annotate.ImageText(string, position=position, color='white',
+                                              outline_color='black', full_outline=full_outline,
+                                              font=font)
+                    image = Image.new('RGB', (120, 100), 'blue')
+                    expected = image.copy()
+                    text.render(ImageDraw.Draw(image), bounds)
+                    _render_with_draw_text(text, ImageDraw.Draw(expected), bounds)
+                    self.assertEqual(image.tobytes(), expected.tobytes(),
+                                     msg="text=%r full_outline=%s position=%s bounds=%s" %
+                                         (string, full_outline, position, bounds))
+
+    def test_outline_integer_bounds(self):
+        self.assertRendersAsDrawText((10, 20, 100, 90))
+
+    def test_outline_fractional_bounds(self):
+        # bounds of boxes scaled by annotate_image are rarely whole pixels
+        scale = 1.37
+        self.assertRendersAsDrawText(tuple(v * scale for v in (7.6, 14.3, 73.1, 58.8)))
+        self.assertRendersAsDrawText((3.25, 5.5, 61.75, 40.125))
+
+    def test_outline_partly_off_image(self):
+        self.assertRendersAsDrawText((-4.6, -3.3, 50.2, 40.7))
+        self.assertRendersAsDrawText((-7, -5, 40, 30))
+
+    def test_outline_truetype_font(self):
+        # Glyphs such as 'j' start left of the text position in TrueType fonts
+        for size in (11, 17, 24):
+            font = _truetype_font(size)
+            for bounds in ((10, 20, 100, 90), (3.25, 5.5, 61.75, 40.125), (-4.6, -3.3, 50.2, 40.7)):
+                self.assertRendersAsDrawText(bounds, font, strings=("jfy", "Wj\nfy g", "Face 1"))
+
+
+class _FakeObject:
+    descriptive_name = "Cube 1 (id 42)"
+
+    def __init__(self, box):
+        self.last_observed_image_box = box
+
+
+class ObjectAnnotatorTests(unittest.TestCase):
+    def annotate(self, *boxes, label_for_obj=None):
+        world = SimpleNamespace(visible_objects=[_FakeObject(box) for box in boxes])
+        annotator = annotate.ObjectAnnotator(SimpleNamespace(world=world))
+        if label_for_obj is not None:
+            annotator.label_for_obj = label_for_obj
+        image = Image.new('RGB', (120, 100), 'blue')
+        blank = image.tobytes()
+        annotator.apply(image, 1)
+        return image.tobytes() != blank
+
+    def test_box_on_image_is_drawn(self):
+        self.assertTrue(self.annotate(util.ImageBox(10, 10, 40, 40)))
+
+    def test_label_visible_past_box_is_drawn(self):
+        # The box itself is past the right edge, but its bottom-right label is
+        # wider than the box and extends back onto the image.
+        self.assertTrue(self.annotate(util.ImageBox(125, 50, 10, 10)))
+
+    def test_box_and_label_off_image_are_skipped(self):
+        self.assertFalse(self.annotate(util.ImageBox(-300, 10, 40, 40),
+                                       util.ImageBox(10, 150, 40, 40)))
+
+    def test_custom_label_off_image_box_is_rendered(self):
+        # Labels only need a render method; where they draw is up to them
+        rendered = []
+
+        class Label:
+            def render(self, draw, bounds):
+                rendered.append(bounds)
+
+        self.annotate(util.ImageBox(-300, 10, 40, 40), label_for_obj=lambda obj: [Label()])
+        self.assertEqual(rendered, [(-300, 10, -260, 50)])
+
+
+class BoxBoundsTests(unittest.TestCase):
+    def test_unscaled(self):
+        box_bounds = annotate._box_bounds_func(1)
+        self.assertEqual(box_bounds(util.ImageBox(1, 2, 3, 4)), (1, 2, 4, 6))
+
+    def test_scaled(self):
+        box_bounds = annotate._box_bounds_func(2.5)
+        self.assertEqual(box_bounds(util.ImageBox(1, 2, 3, 4)), (2.5, 5, 10, 15))
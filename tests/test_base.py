@@ -0,0 +1,224 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from cozmo import base
+from cozmo import event
+
+
+class Slotted(event.Dispatcher):
+    __slots__ = ('value',)
+
+    def __init__(self, value, **kw):
+        super().__init__(**kw)
+        self.value = value
+
+    def __len__(self):
+        return self.value
+
+
+class ProxyClassTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_proxy_wrapped_class_with_slots(self):
+        obj = Slotted(3, loop=self.loop)
+        proxy = base._mkproxy(obj)
+        self.assertIs(proxy.__wrapped__, obj)
+        self.assertIs(obj.__wrapper__, proxy)
+        self.assertEqual(type(proxy).__slots__, ())
+        self.assertEqual(len(proxy), 3)
+        self.assertEqual(proxy.value, 3)
+
+    def test_proxy_class_reused(self):
+        self.assertIs(type(base._mkproxy(Slotted(1, loop=self.loop))),
+                      type(base._mkproxy(Slotted(2, loop=self.loop))))
+
+
+class FactoryOwner(event.Dispatcher):
+    child_factory = dict
+
+
+class FactoryTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_partial_reused_per_instance(self):
+        owner = FactoryOwner(loop=self.loop)
+        factory = owner.child_factory
+        self.assertIs(owner.child_factory, factory)
+        self.assertEqual(factory(a=1), {'a': 1, 'loop': self.loop})
+        self.assertIsNot(FactoryOwner(loop=self.loop).child_factory, factory)
+
+    def test_cache_kept_off_instance(self):
+        owner = FactoryOwner(loop=self.loop)
+        before = set(vars(owner))
+        owner.child_factory
+        self.assertEqual(set(vars(owner)), before)
+
+    def test_cache_entry_released_with_instance(self):
+        owner = FactoryOwner(loop=self.loop)
+        owner.child_factory
+        descriptor = FactoryOwner.__dict__['child_factory']
+        self.assertEqual(len(descriptor._partials), 1)
+        del owner
+        self.assertEqual(len(descriptor._partials), 0)
+
+    def test_factory_reassignment(self):
+        class Owner(event.Dispatcher):
+            child_factory = dict
+
+        owner = Owner(loop=self.loop)
+        owner.child_factory
+        Owner.child_factory = list
+        self.assertIs(owner.child_factory.func, list)
+
+    def test_slotted_instance(self):
+        class SlottedOwner(Slotted):
+            __slots__ = ()
+            child_factory = dict
+
+        owner = SlottedOwner(1, loop=self.loop)
+        self.assertIs(owner.child_factory, owner.child_factory)
+
+    def test_class_access(self):
+        self.assertIsNone(FactoryOwner.child_factory.keywords['loop'])
+
+
+class SyncTarget(event.Dispatcher):
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.value = 3
+        self._blocked = asyncio.Future(loop=self._loop)
+
+    def sync_method(self, a):
+        return a, threading.get_ident()
+
+    async def async_method(self, a):
+        await asyncio.sleep(0)
+        return a * 2, threading.get_ident()
+
+    async def block(self):
+        return await self._blocked
+
+
+class SyncProxyTests(unittest.TestCase):
+    '''Calls made through a _SyncProxy from a thread other than the loop's.'''
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.addCleanup(self.thread.join)
+        self.addCleanup(self.loop.call_soon_threadsafe, self.loop.stop)
+        self.abort_future = concurrent.futures.Future()
+        self.proxy = self.call_in_loop(base._SyncFactory(SyncTarget, self.loop, self.thread.ident,
+                                                         self.abort_future))
+        # release anything still blocked before the loop is stopped
+        self.addCleanup(self.call_in_loop, self.release_blocked)
+
+    def call_in_loop(self, f, *args):
+        result = concurrent.futures.Future()
+
+        def call():
+            try:
+                result.set_result(f(*args))
+            except Exception as exc:
+                result.set_exception(exc)
+
+        self.loop.call_soon_threadsafe(call)
+        return result.result(timeout=5)
+
+    def release_blocked(self):
+        blocked = self.proxy.__wrapped__._blocked
+        if not blocked.done():
+            blocked.set_result(None)
+
+    def test_proxied(self):
+        self.assertIsInstance(self.proxy, base._SyncProxy)
+        self.assertIsInstance(self.proxy.__wrapped__, SyncTarget)
+
+    def test_sync_method_runs_on_loop_thread(self):
+        self.assertEqual(self.proxy.sync_method(1), (1, self.thread.ident))
+
+    def test_async_method_runs_on_loop_thread(self):
+        self.assertEqual(self.proxy.async_method(4), (8, self.thread.ident))
+
+    def test_dispatcher_reused(self):
+        self.assertIs(self.proxy.sync_method, self.proxy.sync_method)
+        self.assertEqual(self.proxy.sync_method.__name__, 'sync_method')
+
+    def test_replaced_method_dispatched(self):
+        self.proxy.sync_method = lambda a: ('replaced', a, threading.get_ident())
+        self.assertEqual(self.proxy.sync_method(1), ('replaced', 1, self.thread.ident))
+
+    def test_attribute_access(self):
+        self.assertEqual(self.proxy.value, 3)
+        self.proxy.value = 4
+        self.assertEqual(self.proxy.__wrapped__.value, 4)
+
+    def test_attribute_access_on_loop_thread(self):
+        def access():
+            # passes straight through to the wrapped object
+            method = self.proxy.sync_method
+            co = self.proxy.async_method(1)
+            co.close()
+            return self.proxy.value, method.__self__, asyncio.iscoroutine(co)
+
+        value, bound_to, is_coroutine = self.call_in_loop(access)
+        self.assertEqual(value, 3)
+        self.assertIs(bound_to, self.proxy.__wrapped__)
+        self.assertTrue(is_coroutine)
+
+    def test_abort_wakes_blocked_waiters(self):
+        results = []
+
+        def wait():
+            try:
+                self.proxy.block()
+            except RuntimeError as exc:
+                results.append(exc)
+
+        threads = [threading.Thread(target=wait) for _ in range(3)]
+        for t in threads:
+            t.start()
+        waiters = base._abort_waiters(self.abort_future)
+        for _ in range(500):
+            if len(waiters) == len(threads):
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(waiters), len(threads))
+
+        exc = RuntimeError("aborted")
+        self.abort_future.set_exception(exc)
+        for t in threads:
+            t.join(timeout=5)
+        self.assertEqual(results, [exc] * len(threads))
+        self.assertEqual(len(waiters), 0)
+
+    def test_call_after_abort(self):
+        exc = RuntimeError("aborted")
+        self.abort_future.set_exception(exc)
+        with self.assertRaises(RuntimeError) as cm:
+            self.proxy.block()
+        self.assertIs(cm.exception, exc)
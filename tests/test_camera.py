@@ -0,0 +1,209 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import asyncio
+import collections
+import io
+import threading
+
+import numpy as np
+from PIL import Image
+
+from cozmo import camera
+from cozmo._clad import _clad_to_game_cozmo
+
+
+_ImageChunk = collections.namedtuple('_ImageChunk',
+        'imageId chunkId imageChunkCount resolution imageEncoding data')
+
+
+class _FakeConn:
+    def send_msg(self, msg):
+        pass
+
+
+class _FakeRobot:
+    conn = _FakeConn()
+
+
+def _chunk(image_id, chunk_id, chunk_count=1, data=b'\x00frame'):
+    return _ImageChunk(imageId=image_id, chunkId=chunk_id, imageChunkCount=chunk_count,
+                       resolution=_clad_to_game_cozmo.ImageResolution.QVGA,
+                       imageEncoding=_clad_to_game_cozmo.ImageEncoding.JPEGColor,
+                       data=data + bytes([image_id]))
+
+
+class CameraDecodeTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.camera = camera.Camera(_FakeRobot(), loop=self.loop)
+        self.addCleanup(self.camera._close)
+
+        # Stand in for the JPEG decoder: hold each decode until released and
+        # return the frame's image id in place of an image.
+        self.release = threading.Semaphore(0)
+        self.decoded = []
+        def decode(data, size=None):
+            self.release.acquire()
+            self.decoded.append(data)
+            return data[-1]
+        patcher = mock.patch.object(camera, '_decode_image', decode)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.images = []
+        self.camera.add_event_handler(camera.EvtNewRawCameraImage,
+                                      lambda evt, image, **kw: self.images.append(image))
+
+    def send(self, msg):
+        self.camera._recv_msg_image_chunk(None, msg=msg)
+
+    def finish_decodes(self, count):
+        for _ in range(count):
+            self.release.release()
+        # run until the decoded images have been dispatched to handlers
+        async def wait():
+            while self.camera._decode_in_progress or self.camera._decode_pending:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+        self.loop.run_until_complete(asyncio.wait_for(wait(), 5))
+
+    def test_frames_delivered_in_order(self):
+        for image_id in (1, 2, 3):
+            self.send(_chunk(image_id, 0))
+            self.finish_decodes(1)
+        self.assertEqual(self.images, [1, 2, 3])
+
+    def test_stale_pending_frames_dropped(self):
+        # 1 is being decoded while 2, 3 and 4 arrive: only the newest waits
+        for image_id in (1, 2, 3, 4):
+            self.send(_chunk(image_id, 0))
+        self.assertTrue(self.camera._decode_in_progress)
+        self.finish_decodes(2)
+        self.assertEqual(self.images, [1, 4])
+
+    def test_out_of_order_chunks_discarded(self):
+        self.send(_chunk(1, 1, chunk_count=2))
+        self.send(_chunk(1, 0, chunk_count=2))
+        self.send(_chunk(2, 0, chunk_count=2))
+        self.send(_chunk(2, 1, chunk_count=2))
+        self.finish_decodes(1)
+        self.assertEqual(self.images, [2])
+
+    def test_oversized_chunks(self):
+        # chunk data may be longer than IMAGE_CHUNK_SIZE
+        size = _clad_to_game_cozmo.ImageConstants.IMAGE_CHUNK_SIZE + 100
+        first, second = b'\x01' * size, b'\x02' * size
+        self.send(_chunk(1, 0, chunk_count=2, data=first))
+        self.send(_chunk(1, 1, chunk_count=2, data=second))
+        self.finish_decodes(1)
+        self.assertEqual(self.images, [1])
+        self.assertEqual(self.decoded, [first + b'\x01' + second + b'\x01'])
+
+        # the grown buffer is reused for the next image
+        self.send(_chunk(2, 0))
+        self.finish_decodes(1)
+        self.assertEqual(self.decoded[1], b'\x00frame\x02')
+
+    def test_close_shuts_down_executor(self):
+        self.send(_chunk(1, 0))
+        self.send(_chunk(2, 0))
+        executor = self.camera._decode_executor
+        self.camera._close()
+        self.assertIsNone(self.camera._decode_executor)
+        self.assertIsNone(self.camera._decode_pending)
+        self.finish_decodes(1)
+        self.assertEqual(self.images, [1])
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+
+class MiniToJpegTests(unittest.TestCase):
+    width, height = 320, 240
+
+    def convert(self, mini, header=camera._MINIGRAY_JPEG_HEADER):
+        mini = np.frombuffer(bytes(mini), dtype=np.uint8)
+        return camera._mini_to_jpeg_helper(mini, self.width, self.height, header).tobytes()
+
+    def expected(self, body, header=camera._MINIGRAY_JPEG_HEADER):
+        sized = bytearray(header)
+        sized[0x5e:0x62] = b'\x00\xf0\x01\x40'  # height 240, width 320
+        return bytes(sized) + body + b'\xff\xd9'
+
+    def test_payload_copied_after_color_flag(self):
+        self.assertEqual(self.convert(b'\x00\x12\x34\x56'), self.expected(b'\x12\x34\x56'))
+
+    def test_color_header(self):
+        header = camera._MINICOLOR_JPEG_HEADER
+        self.assertEqual(self.convert(b'\x01\x12\x34', header), self.expected(b'\x12\x34', header))
+
+    def test_ff_bytes_stuffed(self):
+        self.assertEqual(self.convert(b'\x00\xff\x12\xff\xff\x34'),
+                         self.expected(b'\xff\x00\x12\xff\x00\xff\x00\x34'))
+
+    def test_trailing_padding_removed(self):
+        self.assertEqual(self.convert(b'\x00\x12\xff\x34\xff\xff\xff'),
+                         self.expected(b'\x12\xff\x00\x34'))
+
+    def test_trailing_ff_before_padding(self):
+        # a final 0xFF is indistinguishable from padding, so is dropped too
+        self.assertEqual(self.convert(b'\x00\x12\x34\xff'), self.expected(b'\x12\x34'))
+
+    def test_all_padding(self):
+        self.assertEqual(self.convert(b'\xff\xff\xff\xff'), self.expected(b''))
+
+    def test_color_flag_only(self):
+        self.assertEqual(self.convert(b'\x00\xff\xff'), self.expected(b''))
+        self.assertEqual(self.convert(b'\x00'), self.expected(b''))
+
+    def test_header_not_modified(self):
+        header = bytes(camera._MINIGRAY_JPEG_HEADER)
+        self.convert(b'\x00\x12')
+        self.assertEqual(camera._MINIGRAY_JPEG_HEADER, header)
+        self.assertFalse(camera._sized_jpeg_header(header, self.width, self.height).flags.writeable)
+
+
+class TurboJPEGTests(unittest.TestCase):
+    def setUp(self):
+        camera._turbojpeg_decoder.cache_clear()
+        self.addCleanup(camera._turbojpeg_decoder.cache_clear)
+
+    def jpeg(self):
+        buf = io.BytesIO()
+        Image.new('RGB', (8, 6), 'red').save(buf, 'JPEG')
+        return buf.getvalue()
+
+    def test_decoder_created_on_first_use(self):
+        decoder = mock.Mock()
+        with mock.patch.object(camera, 'TurboJPEG', return_value=decoder) as turbojpeg:
+            self.assertIs(camera._turbojpeg_decoder(), decoder)
+            self.assertIs(camera._turbojpeg_decoder(), decoder)
+        turbojpeg.assert_called_once_with()
+
+    def test_library_not_loaded(self):
+        with mock.patch.object(camera, 'TurboJPEG', side_effect=OSError("no libturbojpeg")):
+            with self.assertLogs(camera.logger, 'WARNING'):
+                self.assertIsNone(camera._turbojpeg_decoder())
+            image = camera._decode_image(self.jpeg())
+        self.assertEqual(image.size, (8, 6))
+        self.assertEqual(image.mode, 'RGB')
+
+    def test_other_errors_raised(self):
+        with mock.patch.object(camera, 'TurboJPEG', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                camera._turbojpeg_decoder()
@@ -0,0 +1,86 @@
+# Copyright (c) 2016 Anki, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License in the file LICENSE.txt or at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import asyncio
+
+from cozmo import event
+
+
+class EvtWaitForTest(event.Event):
+    "Event for the Dispatcher.wait_for tests"
+    param = "Parameter"
+
+
+class WaitForTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.dispatcher = event.Dispatcher(loop=self.loop)
+
+        # Record the handles of timers armed by wait_for
+        self.timers = []
+        call_later = self.loop.call_later
+        def record_call_later(*args):
+            handle = mock.Mock(wraps=call_later(*args))
+            self.timers.append(handle)
+            return handle
+        patcher = mock.patch.object(self.loop, 'call_later', side_effect=record_call_later)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_briefly(self):
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+    def test_event_before_timeout(self):
+        waiter = asyncio.ensure_future(self.dispatcher.wait_for(EvtWaitForTest, timeout=10),
+                                       loop=self.loop)
+        self.run_briefly()
+        self.assertEqual(len(self.timers), 1)
+        self.assertFalse(self.timers[0].cancel.called)
+
+        self.dispatcher.dispatch_event(EvtWaitForTest, param=123)
+        evt = self.loop.run_until_complete(waiter)
+        self.assertEqual(evt.param, 123)
+        # the timeout timer is cancelled once the event arrives
+        self.timers[0].cancel.assert_called_once_with()
+
+    def test_timeout(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(self.dispatcher.wait_for(EvtWaitForTest, timeout=0.01))
+        self.assertEqual(len(self.timers), 1)
+        self.timers[0].cancel.assert_called_once_with()
+
+        # an event arriving after the timeout is ignored by the expired wait
+        self.dispatcher.dispatch_event(EvtWaitForTest, param=123)
+        self.run_briefly()
+
+    def test_cancelled(self):
+        waiter = asyncio.ensure_future(self.dispatcher.wait_for(EvtWaitForTest, timeout=10),
+                                       loop=self.loop)
+        self.run_briefly()
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(waiter)
+        self.timers[0].cancel.assert_called_once_with()
+
+    def test_no_timeout(self):
+        waiter = asyncio.ensure_future(self.dispatcher.wait_for(EvtWaitForTest, timeout=None),
+                                       loop=self.loop)
+        self.run_briefly()
+        self.dispatcher.dispatch_event(EvtWaitForTest, param=123)
+        self.assertEqual(self.loop.run_until_complete(waiter).param, 123)
+        self.assertEqual(self.timers, [])